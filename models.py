@@ -1,10 +1,21 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.mutable import MutableDict, MutableList
 from datetime import datetime
 import uuid
 
 db = SQLAlchemy()
 
+# JSON document column type: stored as JSONB on PostgreSQL (decoded natively
+# by the driver on row load) with a plain JSON fallback for SQLite dev.
+# Returned as a factory because the mutable extensions associate their
+# listeners by type-instance identity — columns sharing one instance would
+# all pick up every listener (MutableDict AND MutableList), rejecting
+# valid values. Each column must get its own instance.
+def JSONDocument():
+    return db.JSON().with_variant(JSONB, 'postgresql')
+
 class Company(db.Model):
     __tablename__ = 'companies'
     
@@ -192,8 +203,8 @@ class CourseQuiz(db.Model):
     __tablename__ = 'skillstown_course_quizzes'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_course_id = db.Column(db.Integer, db.ForeignKey('skillstown_user_courses.id'), nullable=False)
-    quiz_api_id = db.Column(db.String(100), nullable=False)  # ID from the quiz API
+    user_course_id = db.Column(db.Integer, db.ForeignKey('skillstown_user_courses.id'), nullable=False, index=True)
+    quiz_api_id = db.Column(db.String(100), nullable=False, index=True)  # ID from the quiz API
     quiz_title = db.Column(db.String(255))
     quiz_description = db.Column(db.Text)
     questions_count = db.Column(db.Integer)
@@ -220,7 +231,16 @@ class CourseQuizAttempt(db.Model):
     feedback_improvements = db.Column(db.Text)
     user_answers = db.Column(db.Text)  # JSON array of user answers
     completed_at = db.Column(db.DateTime, default=db.func.current_timestamp())
-    
+
+    # Composite indexes matching the hot quiz-route lookups; completed_at
+    # DESC lets the attempt listings read newest-first straight off the
+    # index instead of sorting after the join
+    __table_args__ = (
+        db.Index('ix_skillstown_quiz_attempts_attempt_user', 'attempt_api_id', 'user_id'),
+        db.Index('ix_skillstown_quiz_attempts_user_cq_completed',
+                 'user_id', 'course_quiz_id', db.text('completed_at DESC')),
+    )
+
     # Relationships
     user = db.relationship('Student', backref='quiz_attempts')
     course_quiz = db.relationship('CourseQuiz', backref='attempts')
@@ -231,14 +251,19 @@ class UserLearningProgress(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.String(36), db.ForeignKey('students.id'), nullable=False)
     course_id = db.Column(db.String(50), nullable=False)
-    knowledge_areas = db.Column(db.Text)  # JSON string
-    weak_areas = db.Column(db.Text)  # JSON array
-    strong_areas = db.Column(db.Text)  # JSON array
-    recommended_topics = db.Column(db.Text)  # JSON array
-    learning_curve = db.Column(db.Text)  # JSON array
+    # Mutable wrappers track in-place mutation (append, item assignment) so
+    # callers don't need to copy-and-reassign for changes to be persisted
+    knowledge_areas = db.Column(MutableDict.as_mutable(JSONDocument()))  # JSON object
+    weak_areas = db.Column(MutableList.as_mutable(JSONDocument()))  # JSON array
+    strong_areas = db.Column(MutableList.as_mutable(JSONDocument()))  # JSON array
+    recommended_topics = db.Column(MutableList.as_mutable(JSONDocument()))  # JSON array
+    learning_curve = db.Column(MutableList.as_mutable(JSONDocument()))  # JSON array
     overall_progress = db.Column(db.Integer, default=0)
     mastery_level = db.Column(db.String(20), default='beginner')
-    last_updated = db.Column(db.DateTime, default=db.func.current_timestamp())
+    # onupdate keeps last_updated honest for any write path, which the
+    # serializer cache relies on for its (id, last_updated) key
+    last_updated = db.Column(db.DateTime, default=db.func.current_timestamp(),
+                             onupdate=db.func.current_timestamp())
     
     __table_args__ = (db.UniqueConstraint('user_id', 'course_id', name='unique_user_course_progress'),)
     
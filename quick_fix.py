@@ -1,199 +1,223 @@
 import os
 import sys
-from sqlalchemy import create_engine, text, inspect
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+# Quiz-table DDL, one statement per entry, in FK dependency order.
+# IF NOT EXISTS makes every statement idempotent server-side, which
+# replaces the old get_table_names() probe and per-table branching.
+POSTGRES_TABLES = (
+    """CREATE TABLE IF NOT EXISTS skillstown_user_courses (
+        id SERIAL PRIMARY KEY,
+        user_id VARCHAR(36) NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+        category VARCHAR(100) NOT NULL,
+        course_name VARCHAR(255) NOT NULL,
+        status VARCHAR(50) DEFAULT 'enrolled',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT skillstown_user_course_unique UNIQUE (user_id, course_name)
+    )""",
+    """CREATE TABLE IF NOT EXISTS skillstown_course_details (
+        id SERIAL PRIMARY KEY,
+        user_course_id INTEGER NOT NULL REFERENCES skillstown_user_courses(id) ON DELETE CASCADE,
+        description TEXT,
+        progress_percentage INTEGER DEFAULT 0,
+        completed_at TIMESTAMP,
+        materials TEXT,
+        quiz_results TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS skillstown_course_quizzes (
+        id SERIAL PRIMARY KEY,
+        user_course_id INTEGER NOT NULL REFERENCES skillstown_user_courses(id) ON DELETE CASCADE,
+        quiz_api_id VARCHAR(100) NOT NULL,
+        quiz_title VARCHAR(255),
+        quiz_description TEXT,
+        questions_count INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS skillstown_quiz_attempts (
+        id SERIAL PRIMARY KEY,
+        user_id VARCHAR(36) NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+        course_quiz_id INTEGER NOT NULL REFERENCES skillstown_course_quizzes(id) ON DELETE CASCADE,
+        attempt_api_id VARCHAR(100) NOT NULL,
+        score INTEGER,
+        total_questions INTEGER,
+        correct_answers INTEGER,
+        feedback_strengths TEXT,
+        feedback_improvements TEXT,
+        user_answers TEXT,
+        completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+)
+
+SQLITE_TABLES = (
+    """CREATE TABLE IF NOT EXISTS skillstown_user_courses (
+        id INTEGER PRIMARY KEY,
+        user_id VARCHAR(36) NOT NULL,
+        category VARCHAR(100) NOT NULL,
+        course_name VARCHAR(255) NOT NULL,
+        status VARCHAR(50) DEFAULT 'enrolled',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES students(id) ON DELETE CASCADE,
+        UNIQUE (user_id, course_name)
+    )""",
+    """CREATE TABLE IF NOT EXISTS skillstown_course_details (
+        id INTEGER PRIMARY KEY,
+        user_course_id INTEGER NOT NULL,
+        description TEXT,
+        progress_percentage INTEGER DEFAULT 0,
+        completed_at TIMESTAMP,
+        materials TEXT,
+        quiz_results TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_course_id) REFERENCES skillstown_user_courses(id) ON DELETE CASCADE
+    )""",
+    """CREATE TABLE IF NOT EXISTS skillstown_course_quizzes (
+        id INTEGER PRIMARY KEY,
+        user_course_id INTEGER NOT NULL,
+        quiz_api_id VARCHAR(100) NOT NULL,
+        quiz_title VARCHAR(255),
+        quiz_description TEXT,
+        questions_count INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_course_id) REFERENCES skillstown_user_courses(id) ON DELETE CASCADE
+    )""",
+    """CREATE TABLE IF NOT EXISTS skillstown_quiz_attempts (
+        id INTEGER PRIMARY KEY,
+        user_id VARCHAR(36) NOT NULL,
+        course_quiz_id INTEGER NOT NULL,
+        attempt_api_id VARCHAR(100) NOT NULL,
+        score INTEGER,
+        total_questions INTEGER,
+        correct_answers INTEGER,
+        feedback_strengths TEXT,
+        feedback_improvements TEXT,
+        user_answers TEXT,
+        completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES students(id) ON DELETE CASCADE,
+        FOREIGN KEY (course_quiz_id) REFERENCES skillstown_course_quizzes(id) ON DELETE CASCADE
+    )""",
+)
+
+# The Postgres statements can go to the server as one semicolon-joined
+# batch; sqlite3's execute() rejects multi-statement strings and its
+# executescript() issues an implicit COMMIT that would break the
+# enclosing transaction, so the SQLite path loops instead.
+POSTGRES_TABLES_SCRIPT = ";\n".join(POSTGRES_TABLES)
 
 def get_database_url():
     """Get database URL from environment"""
     db_url = os.environ.get('DATABASE_URL')
     if db_url and db_url.startswith('postgres://'):
         db_url = db_url.replace('postgres://', 'postgresql://')
-    return db_url or 'sqlite:///skillstown.db'
+    if db_url:
+        return db_url
+    # Resolve the dev fallback against this file rather than the CWD, so
+    # running the script from another directory can't silently create
+    # and "fix" an empty database in the wrong place
+    fallback = Path(__file__).resolve().parent / 'skillstown.db'
+    return f"sqlite:///{fallback}"
+
+_ENGINE = None
+
+def _engine():
+    """Build the engine once and reuse it across this script's steps.
+
+    create_missing_tables and test_tables each opened their own engine
+    and connection; sharing one lets the pool hand the verification step
+    the connection the setup step already opened (with its SQLite
+    pragmas applied).
+    """
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = create_engine(get_database_url(), pool_pre_ping=True, pool_size=2)
+    return _ENGINE
+
+def apply_sqlite_pragmas(conn):
+    """Tune a SQLite connection before running DDL.
+
+    journal_mode=WAL persists in the file header, so the first run here
+    upgrades the database for the app as well — WAL avoids the double
+    write (journal + main file) of the default rollback journal, and
+    synchronous=NORMAL drops the extra fsync per commit that FULL pays.
+    The WAL switch is guarded so reruns don't rewrite the header. Runs
+    through the raw DB-API connection because journal_mode cannot change
+    inside a transaction and SQLAlchemy autobegins one.
+    """
+    raw = conn.connection
+    # page_size only takes effect before the first table exists (and
+    # cannot change once the file is in WAL mode), so this script is the
+    # one place positioned to pick it: larger pages mean shallower
+    # B-trees and fewer page reads per lookup as the tables grow. Only
+    # applied to a fresh database — rewriting an existing file would
+    # need a VACUUM, which can't run here inside a transaction
+    if raw.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone() is None:
+        raw.execute("PRAGMA page_size=8192")
+    if raw.execute("PRAGMA journal_mode").fetchone()[0] != 'wal':
+        raw.execute("PRAGMA journal_mode=WAL")
+    raw.execute("PRAGMA synchronous=NORMAL")
+    raw.execute("PRAGMA temp_store=MEMORY")
+    raw.execute("PRAGMA cache_size=-20000")
 
 def create_missing_tables():
     """Create all missing tables for quiz integration"""
-    
+
     print("🔧 Creating missing tables for quiz integration...")
-    
+
     db_url = get_database_url()
-    engine = create_engine(db_url)
-    inspector = inspect(engine)
-    existing_tables = inspector.get_table_names()
-    
+    engine = _engine()
+    is_postgresql = 'postgresql' in db_url
+
     print(f"Database: {db_url}")
-    print(f"Existing tables: {existing_tables}")
-    
+
     try:
         with engine.connect() as conn:
+            if not is_postgresql:
+                apply_sqlite_pragmas(conn)
+
             trans = conn.begin()
-            
+
             try:
-                # 1. Create skillstown_user_courses table if not exists
-                if 'skillstown_user_courses' not in existing_tables:
-                    print("📝 Creating skillstown_user_courses table...")
-                    
-                    if 'postgresql' in db_url:
-                        conn.execute(text("""
-                            CREATE TABLE skillstown_user_courses (
-                                id SERIAL PRIMARY KEY,
-                                user_id VARCHAR(36) NOT NULL REFERENCES students(id) ON DELETE CASCADE,
-                                category VARCHAR(100) NOT NULL,
-                                course_name VARCHAR(255) NOT NULL,
-                                status VARCHAR(50) DEFAULT 'enrolled',
-                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                                CONSTRAINT skillstown_user_course_unique UNIQUE (user_id, course_name)
-                            )
-                        """))
-                    else:
-                        conn.execute(text("""
-                            CREATE TABLE skillstown_user_courses (
-                                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                user_id VARCHAR(36) NOT NULL,
-                                category VARCHAR(100) NOT NULL,
-                                course_name VARCHAR(255) NOT NULL,
-                                status VARCHAR(50) DEFAULT 'enrolled',
-                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                                FOREIGN KEY (user_id) REFERENCES students(id) ON DELETE CASCADE,
-                                UNIQUE (user_id, course_name)
-                            )
-                        """))
-                    print("✅ skillstown_user_courses table created")
-                else:
-                    print("✅ skillstown_user_courses table already exists")
-                
-                # 2. Add quiz_user_uuid column to students if not exists
-                print("📝 Checking quiz_user_uuid column in students table...")
-                
-                columns = [col['name'] for col in inspector.get_columns('students')]
-                if 'quiz_user_uuid' not in columns:
-                    if 'postgresql' in db_url:
-                        conn.execute(text("ALTER TABLE students ADD COLUMN quiz_user_uuid VARCHAR(36) UNIQUE"))
-                    else:
-                        conn.execute(text("ALTER TABLE students ADD COLUMN quiz_user_uuid TEXT UNIQUE"))
-                    print("✅ quiz_user_uuid column added to students")
+                # 1. Create the quiz tables. IF NOT EXISTS replaces the
+                # old table-name probe and per-table branching; Postgres
+                # gets the whole batch in one round trip
+                print("📝 Creating quiz tables...")
+                if is_postgresql:
+                    conn.exec_driver_sql(POSTGRES_TABLES_SCRIPT)
                 else:
-                    print("✅ quiz_user_uuid column already exists")
-                
-                # 3. Create skillstown_course_details table if not exists
-                if 'skillstown_course_details' not in existing_tables:
-                    print("📝 Creating skillstown_course_details table...")
-                    
-                    if 'postgresql' in db_url:
-                        conn.execute(text("""
-                            CREATE TABLE skillstown_course_details (
-                                id SERIAL PRIMARY KEY,
-                                user_course_id INTEGER NOT NULL REFERENCES skillstown_user_courses(id) ON DELETE CASCADE,
-                                description TEXT,
-                                progress_percentage INTEGER DEFAULT 0,
-                                completed_at TIMESTAMP,
-                                materials TEXT,
-                                quiz_results TEXT,
-                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                            )
-                        """))
-                    else:
-                        conn.execute(text("""
-                            CREATE TABLE skillstown_course_details (
-                                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                user_course_id INTEGER NOT NULL,
-                                description TEXT,
-                                progress_percentage INTEGER DEFAULT 0,
-                                completed_at TIMESTAMP,
-                                materials TEXT,
-                                quiz_results TEXT,
-                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                                FOREIGN KEY (user_course_id) REFERENCES skillstown_user_courses(id) ON DELETE CASCADE
-                            )
-                        """))
-                    print("✅ skillstown_course_details table created")
-                else:
-                    print("✅ skillstown_course_details table already exists")
-                
-                # 4. Create skillstown_course_quizzes table if not exists
-                if 'skillstown_course_quizzes' not in existing_tables:
-                    print("📝 Creating skillstown_course_quizzes table...")
-                    
-                    if 'postgresql' in db_url:
-                        conn.execute(text("""
-                            CREATE TABLE skillstown_course_quizzes (
-                                id SERIAL PRIMARY KEY,
-                                user_course_id INTEGER NOT NULL REFERENCES skillstown_user_courses(id) ON DELETE CASCADE,
-                                quiz_api_id VARCHAR(100) NOT NULL,
-                                quiz_title VARCHAR(255),
-                                quiz_description TEXT,
-                                questions_count INTEGER,
-                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                            )
-                        """))
-                    else:
-                        conn.execute(text("""
-                            CREATE TABLE skillstown_course_quizzes (
-                                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                user_course_id INTEGER NOT NULL,
-                                quiz_api_id VARCHAR(100) NOT NULL,
-                                quiz_title VARCHAR(255),
-                                quiz_description TEXT,
-                                questions_count INTEGER,
-                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                                FOREIGN KEY (user_course_id) REFERENCES skillstown_user_courses(id) ON DELETE CASCADE
-                            )
-                        """))
-                    print("✅ skillstown_course_quizzes table created")
-                else:
-                    print("✅ skillstown_course_quizzes table already exists")
-                
-                # 5. Create skillstown_quiz_attempts table if not exists
-                if 'skillstown_quiz_attempts' not in existing_tables:
-                    print("📝 Creating skillstown_quiz_attempts table...")
-                    
-                    if 'postgresql' in db_url:
-                        conn.execute(text("""
-                            CREATE TABLE skillstown_quiz_attempts (
-                                id SERIAL PRIMARY KEY,
-                                user_id VARCHAR(36) NOT NULL REFERENCES students(id) ON DELETE CASCADE,
-                                course_quiz_id INTEGER NOT NULL REFERENCES skillstown_course_quizzes(id) ON DELETE CASCADE,
-                                attempt_api_id VARCHAR(100) NOT NULL,
-                                score INTEGER,
-                                total_questions INTEGER,
-                                correct_answers INTEGER,
-                                feedback_strengths TEXT,
-                                feedback_improvements TEXT,
-                                user_answers TEXT,
-                                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                            )
-                        """))
-                    else:
-                        conn.execute(text("""
-                            CREATE TABLE skillstown_quiz_attempts (
-                                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                                user_id VARCHAR(36) NOT NULL,
-                                course_quiz_id INTEGER NOT NULL,
-                                attempt_api_id VARCHAR(100) NOT NULL,
-                                score INTEGER,
-                                total_questions INTEGER,
-                                correct_answers INTEGER,
-                                feedback_strengths TEXT,
-                                feedback_improvements TEXT,
-                                user_answers TEXT,
-                                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                                FOREIGN KEY (user_id) REFERENCES students(id) ON DELETE CASCADE,
-                                FOREIGN KEY (course_quiz_id) REFERENCES skillstown_course_quizzes(id) ON DELETE CASCADE
-                            )
-                        """))
-                    print("✅ skillstown_quiz_attempts table created")
+                    for statement in SQLITE_TABLES:
+                        conn.exec_driver_sql(statement)
+                print("✅ Quiz tables ready")
+
+                # 2. Ensure the quiz_user_uuid column on students.
+                # Postgres checks existence server-side; SQLite has no
+                # ADD COLUMN IF NOT EXISTS, so the duplicate-column
+                # error is the existence check (statement-level on
+                # SQLite — it doesn't poison the transaction)
+                print("📝 Ensuring quiz_user_uuid column on students table...")
+                if is_postgresql:
+                    conn.execute(text(
+                        "ALTER TABLE students ADD COLUMN IF NOT EXISTS quiz_user_uuid VARCHAR(36) UNIQUE"))
                 else:
-                    print("✅ skillstown_quiz_attempts table already exists")
-                
+                    try:
+                        conn.execute(text("ALTER TABLE students ADD COLUMN quiz_user_uuid TEXT UNIQUE"))
+                    except OperationalError:
+                        pass
+                print("✅ quiz_user_uuid column ensured")
+
                 # Commit all changes
                 trans.commit()
                 print("\n🎉 All database tables created successfully!")
-                
+
                 return True
-                
+
             except Exception as e:
                 trans.rollback()
                 print(f"❌ Error creating tables: {e}")
                 return False
-                
+
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         return False
@@ -202,9 +226,8 @@ def test_tables():
     """Test if all tables were created correctly"""
     print("\n🔍 Testing table creation...")
     
-    db_url = get_database_url()
-    engine = create_engine(db_url)
-    
+    engine = _engine()
+
     required_tables = [
         'students',
         'skillstown_user_courses', 
@@ -213,32 +236,50 @@ def test_tables():
         'skillstown_quiz_attempts'
     ]
     
+    is_postgresql = engine.dialect.name == 'postgresql'
+
     try:
         with engine.connect() as conn:
+            # One catalog query covers every table check instead of a
+            # COUNT(*) probe per table; both forms are parameterless or
+            # parameterized, so the driver's statement cache reuses the
+            # prepared plan on reruns
+            if is_postgresql:
+                rows = conn.execute(text(
+                    "SELECT table_name FROM information_schema.tables "
+                    "WHERE table_schema = current_schema()"))
+            else:
+                rows = conn.execute(text(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"))
+            existing = {row[0] for row in rows}
+
             for table in required_tables:
-                try:
-                    result = conn.execute(text(f"SELECT COUNT(*) FROM {table} LIMIT 1"))
+                if table in existing:
                     print(f"✅ {table} - OK")
-                except Exception as e:
-                    print(f"❌ {table} - ERROR: {e}")
-                    return False
-            
-            # Test quiz_user_uuid column
-            try:
-                inspector = inspect(engine)
-                columns = [col['name'] for col in inspector.get_columns('students')]
-                if 'quiz_user_uuid' in columns:
-                    print("✅ students.quiz_user_uuid column - OK")
                 else:
-                    print("❌ students.quiz_user_uuid column - MISSING")
+                    print(f"❌ {table} - MISSING")
                     return False
-            except Exception as e:
-                print(f"❌ Error checking columns: {e}")
+
+            # Test quiz_user_uuid column with a parameterized probe
+            if is_postgresql:
+                has_column = conn.execute(text(
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_schema = current_schema() "
+                    "AND table_name = 'students' AND column_name = :col"),
+                    {'col': 'quiz_user_uuid'}).first()
+            else:
+                has_column = conn.execute(text(
+                    "SELECT 1 FROM pragma_table_info('students') WHERE name = :col"),
+                    {'col': 'quiz_user_uuid'}).first()
+            if has_column:
+                print("✅ students.quiz_user_uuid column - OK")
+            else:
+                print("❌ students.quiz_user_uuid column - MISSING")
                 return False
-            
+
             print("✅ All tables and columns verified!")
             return True
-            
+
     except Exception as e:
         print(f"❌ Table verification failed: {e}")
         return False
@@ -297,11 +338,36 @@ def create_sample_data():
         print(f"❌ Error creating sample data: {e}")
         return False
 
+# One-shot undo for everything this script creates, in reverse FK
+# dependency order. The quiz_user_uuid column on students is left in
+# place: it is harmless when unused and older SQLite cannot DROP COLUMN.
+ROLLBACK_SQL = """-- Rollback for quick_fix.py quiz-table setup
+DROP TABLE IF EXISTS skillstown_quiz_attempts;
+DROP TABLE IF EXISTS skillstown_course_quizzes;
+DROP TABLE IF EXISTS skillstown_course_details;
+DROP TABLE IF EXISTS skillstown_user_courses;
+"""
+
+def write_rollback_script():
+    """Write the rollback SQL next to this file before migrating.
+
+    test_tables() is the postcheck; this is the matching undo, so a
+    half-applied setup can be reverted with one SQL invocation instead
+    of manual surgery.
+    """
+    path = Path(__file__).resolve().parent / 'rollback_quiz_tables.sql'
+    path.write_text(ROLLBACK_SQL)
+    print(f"📝 Rollback script written to {path}")
+    return path
+
 def main():
     """Main function"""
     print("🎯 Quiz Integration Database Setup")
     print("=" * 50)
-    
+
+    # Emit the undo script before touching the database
+    write_rollback_script()
+
     # Create tables
     if not create_missing_tables():
         print("\n❌ Database setup failed!")
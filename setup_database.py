@@ -209,7 +209,7 @@ def create_all_tables():
                 else:
                     conn.execute(text("""
                         CREATE TABLE IF NOT EXISTS skillstown_user_profiles (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            id INTEGER PRIMARY KEY,
                             user_id VARCHAR(36) NOT NULL,
                             cv_text TEXT,
                             job_description TEXT,
@@ -242,7 +242,7 @@ def create_all_tables():
                 else:
                     conn.execute(text("""
                         CREATE TABLE IF NOT EXISTS skillstown_courses (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            id INTEGER PRIMARY KEY,
                             category VARCHAR(100) NOT NULL,
                             name VARCHAR(255) NOT NULL,
                             description TEXT,
@@ -274,7 +274,7 @@ def create_all_tables():
                 else:
                     conn.execute(text("""
                         CREATE TABLE IF NOT EXISTS skillstown_user_courses (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            id INTEGER PRIMARY KEY,
                             user_id VARCHAR(36) NOT NULL,
                             category VARCHAR(100) NOT NULL,
                             course_name VARCHAR(255) NOT NULL,
@@ -304,7 +304,7 @@ def create_all_tables():
                 else:
                     conn.execute(text("""
                         CREATE TABLE IF NOT EXISTS skillstown_course_details (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            id INTEGER PRIMARY KEY,
                             user_course_id INTEGER NOT NULL,
                             description TEXT,
                             progress_percentage INTEGER DEFAULT 0,
@@ -334,7 +334,7 @@ def create_all_tables():
                 else:
                     conn.execute(text("""
                         CREATE TABLE IF NOT EXISTS skillstown_course_quizzes (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            id INTEGER PRIMARY KEY,
                             user_course_id INTEGER NOT NULL,
                             quiz_api_id VARCHAR(100) NOT NULL,
                             quiz_title VARCHAR(255),
@@ -367,7 +367,7 @@ def create_all_tables():
                 else:
                     conn.execute(text("""
                         CREATE TABLE IF NOT EXISTS skillstown_quiz_attempts (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            id INTEGER PRIMARY KEY,
                             user_id VARCHAR(36) NOT NULL,
                             course_quiz_id INTEGER NOT NULL,
                             attempt_api_id VARCHAR(100) NOT NULL,